@@ -25,6 +25,10 @@ INSTALLED_APPS = [
 ]
 AUTH_USER_MODEL = 'users.User'
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.LeanEmailBackend',
+]
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -98,6 +102,16 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.'
@@ -130,4 +144,6 @@ MEDIA_URL = "/dj_media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "dj_media")
 
 RECIPES_LIMIT = 6
+PAGINATION_COUNT_CACHE_TIMEOUT = 60 * 5
+LIST_CACHE_TIMEOUT = 60 * 60 * 2
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
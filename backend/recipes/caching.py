@@ -0,0 +1,50 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_version_key(model):
+    return f'{model._meta.label_lower}:version'
+
+
+def get_cache_version(model):
+    return cache.get_or_set(get_version_key(model), time.time_ns(), None)
+
+
+def bump_cache_version(model):
+    try:
+        cache.incr(get_version_key(model))
+    except ValueError:
+        get_cache_version(model)
+
+
+def table_state(queryset, field='id'):
+    state = queryset.aggregate(count=Count('id'), last=Max(field))
+    return state['count'], state['last']
+
+
+def get_list_state(model):
+    return (*table_state(model.objects.all()), get_cache_version(model))
+
+
+def cache_list(model, timeout):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            state = ':'.join(str(part) for part in get_list_state(model))
+            key = f'{get_version_key(model)}:{state}:{path}'
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
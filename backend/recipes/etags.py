@@ -0,0 +1,40 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+
+from .caching import get_list_state, table_state
+from .models import Tag, Ingredient, Recipe, Favorite, ShoppingCart, Follow
+
+User = get_user_model()
+
+
+def make_etag(*parts):
+    raw = ':'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def tag_list_etag(request, *args, **kwargs):
+    return make_etag(*get_list_state(Tag))
+
+
+def ingredient_list_etag(request, *args, **kwargs):
+    return make_etag(*get_list_state(Ingredient))
+
+
+def recipe_list_etag(request, *args, **kwargs):
+    parts = (
+        *table_state(Recipe.objects.all(), 'updated_at'),
+        *get_list_state(Tag),
+        *get_list_state(Ingredient),
+        *get_list_state(User),
+    )
+    user = request.user
+    if user.is_authenticated:
+        parts += (
+            user.id,
+            *table_state(Favorite.objects.filter(user=user), 'added_date'),
+            *table_state(ShoppingCart.objects.filter(user=user),
+                         'added_date'),
+            *table_state(Follow.objects.filter(user=user), 'created_at'),
+        )
+    return make_etag(*parts)
@@ -14,13 +14,13 @@ class RecipeFilter(filters.FilterSet):
 
     def get_favorite(self, queryset, name, value):
         if value:
-            return Recipe.objects.filter(favorites__user=self.request.user)
-        return Recipe.objects.all()
+            return queryset.filter(favorites__user=self.request.user)
+        return queryset
 
     def get_in_shopping_cart(self, queryset, name, value):
         if value:
-            return Recipe.objects.filter(shopping_cart__user=self.request.user)
-        return Recipe.objects.all()
+            return queryset.filter(shopping_cart__user=self.request.user)
+        return queryset
 
 
 class IngredientFilter(filters.FilterSet):
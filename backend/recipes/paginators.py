@@ -1,5 +1,64 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Paginator
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+from .caching import get_cache_version
+from .models import Recipe, Favorite, ShoppingCart
+
+
+class CachedCountPaginator(Paginator):
+    count_key = None
+    count_from_cache = False
+
+    @cached_property
+    def count(self):
+        try:
+            query = str(self.object_list.query)
+        except (AttributeError, EmptyResultSet):
+            return super().count
+        versions = ':'.join(
+            str(get_cache_version(model))
+            for model in (Recipe, Favorite, ShoppingCart)
+        )
+        self.count_key = 'count:' + hashlib.md5(
+            f'{versions}:{query}'.encode()
+        ).hexdigest()
+        count = cache.get(self.count_key)
+        if count is not None:
+            self.count_from_cache = True
+            return count
+        return self.refresh_count()
+
+    def refresh_count(self):
+        count = self.object_list.count()
+        cache.set(
+            self.count_key,
+            count,
+            settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+        self.count_from_cache = False
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        return count
+
+    def validate_number(self, number):
+        try:
+            number = super().validate_number(number)
+        except EmptyPage:
+            if not self.count_from_cache:
+                raise
+        else:
+            if not self.count_from_cache or number < self.num_pages:
+                return number
+        self.refresh_count()
+        return super().validate_number(number)
+
 
 class CustomPageNumberPaginator(PageNumberPagination):
+    django_paginator_class = CachedCountPaginator
     page_size_query_param = 'limit'
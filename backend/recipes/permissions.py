@@ -9,11 +9,12 @@ class AdminOrAuthorOrReadOnly(permissions.BasePermission):
         return True
 
     def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
         if (request.method in ['PUT', 'PATCH', 'DELETE']
                 and not request.user.is_anonymous):
             return (
-                    request.user == obj.author
+                    obj.author_id == request.user.id
                     or request.user.is_superuser
-                    or request.user.is_admin()
             )
-        return request.method in permissions.SAFE_METHODS
+        return False
@@ -1,7 +1,8 @@
+import serpy
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
 
 from users.serializers import UserDetailSerializer
 from .fields import Base64ImageField
@@ -11,7 +12,6 @@ from .models import (
     Recipe,
     RecipeIngredient,
     ReceiptTag,
-    Follow,
     Favorite,
     ShoppingCart
 )
@@ -49,14 +49,17 @@ class TagSerializer(serializers.ModelSerializer):
         )
 
 
-class IngredientSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Ingredient
-        fields = (
-            'id',
-            'name',
-            'measurement_unit'
-        )
+class TagReadSerializer(serpy.Serializer):
+    id = serpy.IntField()
+    name = serpy.StrField()
+    color = serpy.StrField()
+    slug = serpy.StrField()
+
+
+class IngredientReadSerializer(serpy.Serializer):
+    id = serpy.IntField()
+    name = serpy.StrField()
+    measurement_unit = serpy.StrField()
 
 
 class IngredientInRecipeSerializer(serializers.ModelSerializer):
@@ -129,13 +132,15 @@ class ShowRecipeSerializer(serializers.ModelSerializer):
         )
 
     def get_ingredients(self, obj):
-        record = RecipeIngredient.objects.filter(recipe=obj)
+        record = obj.recipeingredient_set.all()
         return IngredientInRecipeSerializer(record, many=True).data
 
     def get_is_favorited(self, obj):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         user = request.user
         return Favorite.objects.filter(recipe=obj, user=user).exists()
 
@@ -143,6 +148,8 @@ class ShowRecipeSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
         user = request.user
         return ShoppingCart.objects.filter(recipe=obj, user=user).exists()
 
@@ -191,39 +198,39 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
             )
         return data
 
+    def create_ingredients(self, recipe, ingredients_data):
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(
+                ingredient=ingredient['id'],
+                recipe=recipe,
+                amount=ingredient['amount']
+            )
+            for ingredient in ingredients_data
+        ])
+
+    def create_tags(self, recipe, tags_data):
+        ReceiptTag.objects.bulk_create([
+            ReceiptTag(recipe=recipe, tag=tag) for tag in tags_data
+        ])
+
+    @transaction.atomic
     def create(self, validated_data):
         tags_data = validated_data.pop('tags')
         ingredients_data = validated_data.pop('ingredients')
         author = self.context.get('request').user
         recipe = Recipe.objects.create(author=author, **validated_data)
-        for ingredient in ingredients_data:
-            ingredient_model = ingredient['id']
-            amount = ingredient['amount']
-            RecipeIngredient.objects.create(
-                ingredient=ingredient_model,
-                recipe=recipe,
-                amount=amount
-            )
-        for tag in tags_data:
-            ReceiptTag.objects.create(recipe=recipe, tag=tag)
+        self.create_ingredients(recipe, ingredients_data)
+        self.create_tags(recipe, tags_data)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         tags_data = validated_data.pop('tags')
         ingredient_data = validated_data.pop('ingredients')
         ReceiptTag.objects.filter(recipe=instance).delete()
-        for tag in tags_data:
-            ReceiptTag.objects.create(
-                recipe=instance,
-                tag=tag
-            )
+        self.create_tags(instance, tags_data)
         RecipeIngredient.objects.filter(recipe=instance).delete()
-        for new_ingredient in ingredient_data:
-            RecipeIngredient.objects.create(
-                ingredient=new_ingredient['id'],
-                recipe=instance,
-                amount=new_ingredient['amount']
-            )
+        self.create_ingredients(instance, ingredient_data)
         instance.name = validated_data.pop('name')
         instance.text = validated_data.pop('text')
         if validated_data.get('image') is not None:
@@ -242,71 +249,6 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
         return data
 
 
-class FavoriteSerializer(serializers.ModelSerializer):
-    recipe = serializers.PrimaryKeyRelatedField(queryset=Recipe.objects.all())
-    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
-
-    class Meta:
-        model = Favorite
-        fields = (
-            'user',
-            'recipe'
-        )
-
-    def validate(self, data):
-        user = self.context.get('request').user
-        recipe_id = data['recipe'].id
-
-        if (self.context.get('request').method == 'GET'
-                and Favorite.objects.filter(user=user,
-                                            recipe__id=recipe_id).exists()):
-            raise serializers.ValidationError(
-                'Рецепт уже добавлен в избранное')
-
-        recipe = get_object_or_404(Recipe, id=recipe_id)
-
-        if (self.context.get('request').method == 'DELETE'
-                and not Favorite.objects.filter(
-                    user=user,
-                    recipe=recipe).exists()):
-            raise serializers.ValidationError()
-
-        return data
-
-    def to_representation(self, instance):
-        request = self.context.get('request')
-        context = {'request': request}
-        return ShowRecipeAddedSerializer(
-            instance.recipe,
-            context=context).data
-
-
-class ShoppingCartSerializer(FavoriteSerializer):
-    class Meta(FavoriteSerializer.Meta):
-        model = ShoppingCart
-
-    def validate(self, data):
-        user = self.context.get('request').user
-        recipe_id = data['recipe'].id
-        if (self.context.get('request').method == 'GET'
-                and ShoppingCart.objects.filter(
-                    user=user,
-                    recipe__id=recipe_id
-                ).exists()):
-            raise serializers.ValidationError(
-                'Продукты уже в корзине')
-
-        recipe = get_object_or_404(Recipe, id=recipe_id)
-
-        if (self.context.get('request').method == 'DELETE'
-                and not ShoppingCart.objects.filter(
-                    user=user,
-                    recipe=recipe).exists()):
-            raise serializers.ValidationError()
-
-        return data
-
-
 class ShowFollowSerializer(serializers.ModelSerializer):
     is_subscribed = serializers.SerializerMethodField()
     recipes = serializers.SerializerMethodField()
@@ -342,37 +284,3 @@ class ShowFollowSerializer(serializers.ModelSerializer):
 
     def get_recipes_count(self, obj):
         return obj.recipes.count()
-
-
-class FollowSerializer(serializers.ModelSerializer):
-    queryset = User.objects.all()
-    user = serializers.PrimaryKeyRelatedField(queryset=queryset)
-    author = serializers.PrimaryKeyRelatedField(queryset=queryset)
-
-    class Meta:
-        model = Follow
-        fields = (
-            'user',
-            'author'
-        )
-
-    def validate(self, data):
-        user = self.context.get('request').user
-        author_id = data['author'].id
-        follow_exist = Follow.objects.filter(
-            user=user,
-            author__id=author_id
-        ).exists()
-
-        if self.context.get('request').method == 'GET':
-            if user.id == author_id or follow_exist:
-                raise serializers.ValidationError(
-                    'Подписка существует')
-        return data
-
-    def to_representation(self, instance):
-        request = self.context.get('request')
-        context = {'request': request}
-        return ShowFollowSerializer(
-            instance.author,
-            context=context).data
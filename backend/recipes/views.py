@@ -1,12 +1,25 @@
+import io
+import os
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import HttpResponse
+from django.db.models import Exists, OuterRef, Prefetch, Sum
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, generics
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
 
+from .caching import cache_list
+from .etags import tag_list_etag, ingredient_list_etag, recipe_list_etag
 from .filters import RecipeFilter, IngredientFilter
 from .models import (Tag,
                      Ingredient,
@@ -18,35 +31,56 @@ from .models import (Tag,
                      )
 from .paginators import CustomPageNumberPaginator
 from .permissions import AdminOrAuthorOrReadOnly
-from .serializers import (TagSerializer,
-                          IngredientSerializer,
+from .serializers import (TagReadSerializer,
+                          IngredientReadSerializer,
                           ShowRecipeSerializer,
                           CreateRecipeSerializer,
-                          FavoriteSerializer,
-                          ShoppingCartSerializer,
-                          ShowFollowSerializer,
-                          FollowSerializer
+                          ShowRecipeAddedSerializer,
+                          ShowFollowSerializer
                           )
 
 User = get_user_model()
 
+PDF_FONT = 'DejaVuSerif'
+pdfmetrics.registerFont(TTFont(
+    PDF_FONT,
+    os.path.join(os.path.dirname(__file__), 'fonts', 'DejaVuSerif.ttf')
+))
+
+PDF_FONT_SIZE = 15
+PDF_LEADING = 25
+PDF_MARGIN = 50
+
+SHOPPING_LIST_FILENAME = 'wishlist'
+SHOPPING_LIST_TEXT_DISPOSITION = (
+    f'attachment; filename="{SHOPPING_LIST_FILENAME}.txt"'
+)
+
 
+@method_decorator(etag(tag_list_etag), name='list')
+@method_decorator(cache_list(Tag, settings.LIST_CACHE_TIMEOUT), name='list')
 class TagViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
-    serializer_class = TagSerializer
+    serializer_class = TagReadSerializer
     permission_classes = [AllowAny, ]
     pagination_class = None
 
 
+@method_decorator(etag(ingredient_list_etag), name='list')
+@method_decorator(
+    cache_list(Ingredient, settings.LIST_CACHE_TIMEOUT),
+    name='list'
+)
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
-    serializer_class = IngredientSerializer
+    serializer_class = IngredientReadSerializer
     permission_classes = [AllowAny, ]
     pagination_class = None
     filter_backends = [DjangoFilterBackend, ]
     filterset_class = IngredientFilter
 
 
+@method_decorator(etag(recipe_list_etag), name='list')
 class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     permission_classes = [AdminOrAuthorOrReadOnly, ]
@@ -54,6 +88,26 @@ class RecipeViewSet(viewsets.ModelViewSet):
     filterset_class = RecipeFilter
     pagination_class = CustomPageNumberPaginator
 
+    def get_queryset(self):
+        queryset = Recipe.objects.select_related('author').prefetch_related(
+            'tags',
+            Prefetch(
+                'recipeingredient_set',
+                queryset=RecipeIngredient.objects.select_related('ingredient')
+            )
+        )
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(
+                is_favorited=Exists(Favorite.objects.filter(
+                    user=user, recipe=OuterRef('pk')
+                )),
+                is_in_shopping_cart=Exists(ShoppingCart.objects.filter(
+                    user=user, recipe=OuterRef('pk')
+                ))
+            )
+        return queryset
+
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return ShowRecipeSerializer
@@ -70,16 +124,21 @@ class FavoriteViewSet(APIView):
 
     def get(self, request, recipe_id):
         user = request.user
-        data = {
-            'user': user.id,
-            'recipe': recipe_id,
-        }
-        serializer = FavoriteSerializer(
-            data=data,
+        recipe = get_object_or_404(Recipe, id=recipe_id)
+
+        _, created = Favorite.objects.get_or_create(
+            user=user,
+            recipe=recipe
+        )
+        if not created:
+            return Response(
+                {'errors': 'Рецепт уже добавлен в избранное'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = ShowRecipeAddedSerializer(
+            recipe,
             context={'request': request}
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
         return Response(
             serializer.data,
             status=status.HTTP_201_CREATED
@@ -87,11 +146,15 @@ class FavoriteViewSet(APIView):
 
     def delete(self, request, recipe_id):
         user = request.user
-        recipe = get_object_or_404(Recipe, id=recipe_id)
 
-        Favorite.objects.get(
+        deleted, _ = Favorite.objects.filter(
             user=user,
-            recipe=recipe).delete()
+            recipe_id=recipe_id).delete()
+        if not deleted:
+            return Response(
+                {'errors': 'Рецепта нет в избранном'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         return Response(
             status=status.HTTP_204_NO_CONTENT
         )
@@ -102,22 +165,32 @@ class ShoppingCartViewSet(APIView):
 
     def get(self, request, recipe_id):
         user = request.user
-        data = {
-            'user': user.id,
-            'recipe': recipe_id,
-        }
+        recipe = get_object_or_404(Recipe, id=recipe_id)
 
+        _, created = ShoppingCart.objects.get_or_create(
+            user=user,
+            recipe=recipe
+        )
+        if not created:
+            return Response(
+                {'errors': 'Продукты уже в корзине'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         context = {'request': request}
-        serializer = ShoppingCartSerializer(data=data, context=context)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer = ShowRecipeAddedSerializer(recipe, context=context)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete(self, request, recipe_id):
         user = request.user
-        recipe = get_object_or_404(Recipe, id=recipe_id)
 
-        ShoppingCart.objects.get(user=user, recipe=recipe).delete()
+        deleted, _ = ShoppingCart.objects.filter(
+            user=user,
+            recipe_id=recipe_id).delete()
+        if not deleted:
+            return Response(
+                {'errors': 'Рецепта нет в корзине'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         return Response(
             status=status.HTTP_204_NO_CONTENT
         )
@@ -127,34 +200,59 @@ class DownloadShoppingCart(APIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request):
-        shopping_cart = request.user.shopping_cart.all()
-        buying_list = {}
-
-        for item in shopping_cart:
-            ingredients = RecipeIngredient.objects.filter(recipe=item.recipe)
-            for ingredient in ingredients:
-                amount = ingredient.amount
-                name = ingredient.ingredient.name
-                measurement_unit = ingredient.ingredient.measurement_unit
-
-                if name not in buying_list:
-                    buying_list[name] = {
-                        'measurement_unit': measurement_unit,
-                        'amount': amount
-                    }
-                else:
-                    buying_list[name]['amount'] = (buying_list[name]['amount']
-                                                   + amount)
-
-        wishlist = []
-        for item in buying_list:
-            wishlist.append(f'{item} - {buying_list[item]["amount"]} '
-                            f'{buying_list[item]["measurement_unit"]} \n')
-
-        response = HttpResponse(wishlist, 'Content-Type: text/plain')
-        response['Content-Disposition'] = 'attachment; filename="wishlist.txt"'
+        ingredients = RecipeIngredient.objects.filter(
+            recipe__shopping_cart__user=request.user
+        ).values(
+            'ingredient__name',
+            'ingredient__measurement_unit'
+        ).annotate(total=Sum('amount')).order_by('ingredient__name')
+
+        if request.query_params.get('filetype') == 'pdf':
+            return self.get_pdf_response(ingredients)
+        return self.get_text_response(ingredients)
+
+    def get_text_response(self, ingredients):
+        wishlist = (
+            f'{item["ingredient__name"]} - {item["total"]} '
+            f'{item["ingredient__measurement_unit"]} \n'
+            for item in ingredients.iterator()
+        )
+
+        response = StreamingHttpResponse(
+            wishlist,
+            content_type='text/plain; charset=utf-8'
+        )
+        response['Content-Disposition'] = SHOPPING_LIST_TEXT_DISPOSITION
         return response
 
+    def begin_pdf_page(self, page):
+        _, height = A4
+        text = page.beginText(PDF_MARGIN, height - PDF_MARGIN)
+        text.setFont(PDF_FONT, PDF_FONT_SIZE, leading=PDF_LEADING)
+        return text
+
+    def get_pdf_response(self, ingredients):
+        buffer = io.BytesIO()
+        page = canvas.Canvas(buffer, pagesize=A4)
+        text = self.begin_pdf_page(page)
+        for item in ingredients:
+            if text.getY() < PDF_MARGIN:
+                page.drawText(text)
+                page.showPage()
+                text = self.begin_pdf_page(page)
+            text.textLine(
+                f'{item["ingredient__name"]} - {item["total"]} '
+                f'{item["ingredient__measurement_unit"]}'
+            )
+        page.drawText(text)
+        page.save()
+        buffer.seek(0)
+        return FileResponse(
+            buffer,
+            as_attachment=True,
+            filename=f'{SHOPPING_LIST_FILENAME}.pdf'
+        )
+
 
 class ListFollowViewSet(generics.ListAPIView):
     queryset = User.objects.all()
@@ -168,7 +266,16 @@ class ListFollowViewSet(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return User.objects.filter(following__user=user)
+        return User.objects.filter(
+            following__user=user
+        ).prefetch_related(
+            Prefetch(
+                'recipes',
+                queryset=Recipe.objects.only(
+                    'id', 'author', 'name', 'image', 'cooking_time'
+                )
+            )
+        )
 
 
 class FollowViewSet(APIView):
@@ -176,23 +283,40 @@ class FollowViewSet(APIView):
 
     def get(self, request, author_id):
         user = request.user
+        author = get_object_or_404(User, id=author_id)
 
-        data = {
-            'user': user.id,
-            'author': author_id
-        }
-        serializer = FollowSerializer(data=data, context={'request': request})
-
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        if user == author:
+            return Response(
+                {'errors': 'Нельзя подписаться на самого себя'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        _, created = Follow.objects.get_or_create(
+            user=user,
+            author=author
+        )
+        if not created:
+            return Response(
+                {'errors': 'Подписка существует'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = ShowFollowSerializer(
+            author,
+            context={'request': request}
+        )
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete(self, request, author_id):
         user = request.user
-        author = get_object_or_404(User, id=author_id)
-        obj = get_object_or_404(Follow, user=user, author=author)
-        obj.delete()
 
+        deleted, _ = Follow.objects.filter(
+            user=user,
+            author_id=author_id).delete()
+        if not deleted:
+            get_object_or_404(User, id=author_id)
+            return Response(
+                {'errors': 'Подписки не существует'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         return Response(
             status=status.HTTP_204_NO_CONTENT
         )